@@ -1,130 +1,285 @@
-from typing import List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
 import networkx as nx
 import numpy as np
 from numpy.typing import ArrayLike
 
 import pywhy_graphs
-from pywhy_graphs.classes.functions import edge_types
 from pywhy_graphs.config import CLearnEndpoint, EdgeType
 from pywhy_graphs.typing import Node
 
+# all the values that are allowed in a causal-learn array
+_CLEARN_ENDPOINT_VALUES = np.array([endpoint.value for endpoint in CLearnEndpoint])
+
+# the integer values of the causal-learn endpoints, which are used when encoding
+# and decoding arrays rather than constructing CLearnEndpoint members
+_TAIL = CLearnEndpoint.TAIL.value
+_ARROW = CLearnEndpoint.ARROW.value
+_CIRCLE = CLearnEndpoint.CIRCLE.value
+_TAIL_AND_ARROW = CLearnEndpoint.TAIL_AND_ARROW.value
+_ARROW_AND_ARROW = CLearnEndpoint.ARROW_AND_ARROW.value
+_TAIL_AND_TAIL = CLearnEndpoint.TAIL_AND_TAIL.value
+
+# the endpoint values that encode two edges between a pair of nodes
+_MULTI_EDGE_ENDPOINTS = [_ARROW_AND_ARROW, _TAIL_AND_ARROW, _TAIL_AND_TAIL]
+
+
+def _directed_endpoints(graphs: Dict[str, nx.Graph], u: Node, v: Node) -> Tuple[int, int]:
+    if graphs[EdgeType.DIRECTED.value].has_edge(u, v):
+        # u -> v
+        return _TAIL, _ARROW
+    # u <- v
+    return _ARROW, _TAIL
+
+
+def _directed_bidirected_endpoints(
+    graphs: Dict[str, nx.Graph], u: Node, v: Node
+) -> Tuple[int, int]:
+    if graphs[EdgeType.DIRECTED.value].has_edge(u, v):
+        # u -> v and u <-> v
+        return _TAIL_AND_ARROW, _ARROW_AND_ARROW
+    # u <- v and u <-> v
+    return _ARROW_AND_ARROW, _TAIL_AND_ARROW
+
+
+def _directed_undirected_endpoints(
+    graphs: Dict[str, nx.Graph], u: Node, v: Node
+) -> Tuple[int, int]:
+    if graphs[EdgeType.DIRECTED.value].has_edge(u, v):
+        # u -> v and u -- v
+        return _TAIL_AND_TAIL, _TAIL_AND_ARROW
+    # u <- v and u -- v
+    return _TAIL_AND_ARROW, _TAIL_AND_TAIL
+
+
+def _circle_endpoints(graphs: Dict[str, nx.Graph], u: Node, v: Node) -> Tuple[int, int]:
+    # u *-o v
+    circle_G = graphs[EdgeType.CIRCLE.value]
+    uv_circle = circle_G.has_edge(u, v)
+    vu_circle = circle_G.has_edge(v, u)
+
+    # u o-o v cannot be combined with another edge, which is checked for both
+    # orientations so the result does not depend on the order of u and v
+    if uv_circle and not vu_circle:
+        if graphs[EdgeType.DIRECTED.value].has_edge(v, u):
+            return _CIRCLE, _CIRCLE
+        elif graphs[EdgeType.UNDIRECTED.value].has_edge(v, u):
+            return _TAIL, _CIRCLE
+    elif vu_circle and not uv_circle:
+        if graphs[EdgeType.DIRECTED.value].has_edge(u, v):
+            return _CIRCLE, _CIRCLE
+        elif graphs[EdgeType.UNDIRECTED.value].has_edge(u, v):
+            return _CIRCLE, _TAIL
+    raise RuntimeError(f"It is not possible for a PAG to have {u}-{v} with another edge...")
+
+
+# map the edge types between two nodes to a function returning the endpoints
+# at ``u`` and at ``v`` given the internal graphs of the causal graph
+_EDGE_TYPES_TO_ENDPOINTS = {
+    frozenset((EdgeType.DIRECTED.value,)): _directed_endpoints,
+    # u <-> v
+    frozenset((EdgeType.BIDIRECTED.value,)): lambda graphs, u, v: (_ARROW, _ARROW),
+    # u -- v
+    frozenset((EdgeType.UNDIRECTED.value,)): lambda graphs, u, v: (_TAIL, _TAIL),
+    # u o-o v
+    frozenset((EdgeType.CIRCLE.value,)): lambda graphs, u, v: (_CIRCLE, _CIRCLE),
+    frozenset((EdgeType.DIRECTED.value, EdgeType.BIDIRECTED.value)): _directed_bidirected_endpoints,
+    frozenset((EdgeType.DIRECTED.value, EdgeType.UNDIRECTED.value)): _directed_undirected_endpoints,
+    # u -- v and u <-> v
+    frozenset((EdgeType.BIDIRECTED.value, EdgeType.UNDIRECTED.value)): lambda graphs, u, v: (
+        _TAIL_AND_ARROW,
+        _TAIL_AND_ARROW,
+    ),
+    frozenset((EdgeType.CIRCLE.value, EdgeType.DIRECTED.value)): _circle_endpoints,
+    frozenset((EdgeType.CIRCLE.value, EdgeType.UNDIRECTED.value)): _circle_endpoints,
+    frozenset((EdgeType.CIRCLE.value, EdgeType.BIDIRECTED.value)): _circle_endpoints,
+}
+
 
 def _graph_to_clearn_arr(G: nx.MixedEdgeGraph) -> Tuple[ArrayLike, List[Node]]:
-    # define the array
-    arr = np.zeros((G.number_of_nodes(), G.number_of_nodes()), dtype=int)
+    # define the array; all causal-learn endpoint values fit in an int8
+    arr = np.zeros((G.number_of_nodes(), G.number_of_nodes()), dtype=np.int8)
 
     # get the array index based on the order of nodes inside graph
     arr_idx = list(G.nodes)
+    idx_of = {node: idx for idx, node in enumerate(arr_idx)}
 
-    for u in G.nodes:
-        for v in G.nodes:
-            # if the nodes are the same, skip
+    # cache the internal graphs, so edge queries skip the mixed-edge dispatch
+    graphs = G.get_graphs()
+
+    # collect the edge types between each adjacent pair of nodes by iterating
+    # over the edges of each internal graph once
+    pair_types: Dict[FrozenSet[Node], Set[str]] = dict()
+    for edge_type, graph in graphs.items():
+        for u, v in graph.edges:
+            # self-loops are not representable in the causal-learn array
             if u == v:
                 continue
+            pair_types.setdefault(frozenset((u, v)), set()).add(edge_type)
 
-            # if there is no adjacency among u and v, then skip
-            if v not in G.neighbors(u):
-                continue
+    # the array entries are gathered as plain Python ints and written at once,
+    # which avoids a NumPy scalar assignment per endpoint
+    rows: List[int] = []
+    cols: List[int] = []
+    endpoints: List[int] = []
+    for pair, uv_edge_types in pair_types.items():
+        # order the pair by the array index rather than by the arbitrary order of
+        # the frozenset, so the encoding does not depend on the hashing of nodes
+        u, v = sorted(pair, key=idx_of.__getitem__)
 
-            # get indices
-            udx = arr_idx.index(u)
-            vdx = arr_idx.index(v)
-
-            # at this point, there is an edge among u and v
-            uv_edge_types = edge_types(G, u, v)
-            if len(uv_edge_types) == 1:
-                edge_type = uv_edge_types[0]
-                if edge_type == EdgeType.DIRECTED.value:
-                    if G.has_edge(u, v, EdgeType.DIRECTED.value):
-                        # u -> v
-                        endpoint_v = CLearnEndpoint.ARROW
-                        endpoint_u = CLearnEndpoint.TAIL
-                    else:
-                        # u <- v
-                        endpoint_u = CLearnEndpoint.ARROW
-                        endpoint_v = CLearnEndpoint.TAIL
-                elif edge_type == EdgeType.BIDIRECTED.value:
-                    # <->
-                    endpoint_v = CLearnEndpoint.ARROW
-                    endpoint_u = CLearnEndpoint.ARROW
-                elif edge_type == EdgeType.UNDIRECTED.value:
-                    # --
-                    endpoint_v = CLearnEndpoint.TAIL
-                    endpoint_u = CLearnEndpoint.TAIL
-                elif edge_type == EdgeType.CIRCLE.value:
-                    # u o-o v
-                    endpoint_v = CLearnEndpoint.CIRCLE
-                    endpoint_u = CLearnEndpoint.CIRCLE
-                else:
-                    raise RuntimeError(
-                        f"Unrecognizd edge type {edge_type}. Use one of "
-                        f"{[edge.value for edge in EdgeType]}."
-                    )
-            elif len(uv_edge_types) == 2:
-                if (EdgeType.DIRECTED.value in uv_edge_types) and (
-                    EdgeType.BIDIRECTED.value in uv_edge_types
-                ):
-                    if G.has_edge(u, v, EdgeType.DIRECTED.value):
-                        # u -> v and u <-> v
-                        endpoint_v = CLearnEndpoint.ARROW_AND_ARROW
-                        endpoint_u = CLearnEndpoint.TAIL_AND_ARROW
-                    else:
-                        # u <- v and u <-> v
-                        endpoint_u = CLearnEndpoint.ARROW_AND_ARROW
-                        endpoint_v = CLearnEndpoint.TAIL_AND_ARROW
-                elif (EdgeType.DIRECTED.value in uv_edge_types) and (
-                    EdgeType.UNDIRECTED.value in uv_edge_types
-                ):
-                    if G.has_edge(u, v, EdgeType.DIRECTED.value):
-                        # u -> v and u -- v
-                        endpoint_v = CLearnEndpoint.TAIL_AND_ARROW
-                        endpoint_u = CLearnEndpoint.TAIL_AND_TAIL
-                    else:
-                        # u <- v and u -- v
-                        endpoint_u = CLearnEndpoint.TAIL_AND_ARROW
-                        endpoint_v = CLearnEndpoint.TAIL_AND_TAIL
-                elif (EdgeType.BIDIRECTED.value in uv_edge_types) and (
-                    EdgeType.UNDIRECTED.value in uv_edge_types
-                ):
-                    # u -- v and u <-> v
-                    endpoint_v = CLearnEndpoint.TAIL_AND_ARROW
-                    endpoint_u = CLearnEndpoint.TAIL_AND_ARROW
-                elif EdgeType.CIRCLE.value in uv_edge_types:
-                    # u *-o v
-                    if G.has_edge(u, v, EdgeType.CIRCLE.value):
-                        endpoint_v = CLearnEndpoint.CIRCLE
-                        if G.has_edge(v, u, EdgeType.DIRECTED.value):
-                            endpoint_u = CLearnEndpoint.CIRCLE
-                        elif G.has_edge(v, u, EdgeType.UNDIRECTED.value):
-                            endpoint_u = CLearnEndpoint.TAIL
-                        else:
-                            raise RuntimeError(
-                                f"It is not possible for a PAG to have {u}-{v} with another edge..."
-                            )
-                    else:
-                        endpoint_u = CLearnEndpoint.CIRCLE
-                        if G.has_edge(u, v, EdgeType.DIRECTED.value):
-                            endpoint_v = CLearnEndpoint.CIRCLE
-                        elif G.has_edge(u, v, EdgeType.UNDIRECTED.value):
-                            endpoint_v = CLearnEndpoint.TAIL
-                        else:
-                            raise RuntimeError(
-                                f"It is not possible for a PAG to have {u}-{v} with another edge..."
-                            )
-            else:
-                raise RuntimeError(
-                    f"Causal-learn does not support more than two types of edges between nodes. "
-                    f"There are {len(uv_edge_types)} edge types between {u} and {v}."
-                )
-
-            # set the array to the endpoint values
-            arr[udx, vdx] = endpoint_u.value
-            arr[vdx, udx] = endpoint_v.value
+        # get indices
+        udx = idx_of[u]
+        vdx = idx_of[v]
 
+        if len(uv_edge_types) > 2:
+            raise RuntimeError(
+                f"Causal-learn does not support more than two types of edges between nodes. "
+                f"There are {len(uv_edge_types)} edge types between {u} and {v}."
+            )
+
+        get_endpoints = _EDGE_TYPES_TO_ENDPOINTS.get(frozenset(uv_edge_types))
+        if get_endpoints is None:
+            raise RuntimeError(
+                f"Unrecognized edge types {sorted(uv_edge_types)}. Use one of "
+                f"{[edge.value for edge in EdgeType]}."
+            )
+        endpoint_u, endpoint_v = get_endpoints(graphs, u, v)
+
+        # the endpoint at u is stored at (udx, vdx) and the endpoint at v at (vdx, udx)
+        rows += (udx, vdx)
+        cols += (vdx, udx)
+        endpoints += (endpoint_u, endpoint_v)
+
+    # set the array to the endpoint values
+    arr[rows, cols] = endpoints
     return arr, arr_idx
 
 
+# the row/column indices of the source and target nodes of a set of edges
+_IndexPairs = Tuple[np.ndarray, np.ndarray]
+
+
+def _decode_clearn_arr(
+    arr: np.ndarray, multi_edges: bool = True
+) -> Tuple[_IndexPairs, _IndexPairs, _IndexPairs, _IndexPairs]:
+    """Decode a causal-learn array into the edges of each type.
+
+    Parameters
+    ----------
+    arr : np.ndarray of shape (n_nodes, n_nodes)
+        The causal-learn array of valid endpoint values.
+    multi_edges : bool
+        Whether there can be two edges between a pair of nodes. If False, the
+        array must not contain endpoints encoding two edges. Default is True.
+
+    Returns
+    -------
+    directed_pairs, bidirected_pairs, undirected_pairs, circle_pairs : tuple of np.ndarray
+        The row/column indices of the source and target nodes of the
+        directed, bidirected, undirected and circle edges.
+    """
+    # convert each non-zero array entry combination into
+    # an edge in the graph, working on the upper-triangular pairs
+    # of nodes that have at least one non-zero endpoint
+    n_nodes = arr.shape[0]
+    pair_mask = ~np.tri(n_nodes, n_nodes, k=0, dtype=bool)
+    pair_mask &= (arr != 0) | (arr.T != 0)
+
+    # boolean indexing of broadcast row/column indices is cheaper than the
+    # np.nonzero call behind np.triu_indices
+    row_inds = np.broadcast_to(np.arange(n_nodes)[:, None], pair_mask.shape)
+    iu = row_inds[pair_mask]
+    ju = row_inds.T[pair_mask]
+    endpoints_u = arr[pair_mask]
+    endpoints_v = arr.T[pair_mask]
+
+    def _masked_pairs(uv_mask, vu_mask=None) -> _IndexPairs:
+        # the indices of the source and target nodes of the masked pairs, which
+        # are oriented from u to v, and from v to u for ``vu_mask``
+        if vu_mask is None:
+            return iu[uv_mask], ju[uv_mask]
+        return (
+            np.concatenate((iu[uv_mask], ju[vu_mask])),
+            np.concatenate((ju[uv_mask], iu[vu_mask])),
+        )
+
+    # First: check if there are two edges between the nodes, which is only
+    # possible in ADMGs and PAGs
+    if multi_edges:
+        is_multi = np.isin(endpoints_u, _MULTI_EDGE_ENDPOINTS) | np.isin(
+            endpoints_v, _MULTI_EDGE_ENDPOINTS
+        )
+
+        # u -> v and u <-> v
+        multi_uv_bidirected = (
+            is_multi & (endpoints_v == _ARROW_AND_ARROW) & (endpoints_u == _TAIL_AND_ARROW)
+        )
+        # u <- v and u <-> v
+        multi_vu_bidirected = (
+            is_multi & (endpoints_u == _ARROW_AND_ARROW) & (endpoints_v == _TAIL_AND_ARROW)
+        )
+        # u -> v and u -- v
+        multi_uv_undirected = (
+            is_multi & (endpoints_u == _TAIL_AND_TAIL) & (endpoints_v == _TAIL_AND_ARROW)
+        )
+        # u <- v and u -- v
+        multi_vu_undirected = (
+            is_multi & (endpoints_v == _TAIL_AND_TAIL) & (endpoints_u == _TAIL_AND_ARROW)
+        )
+        # u -- v and u <-> v
+        multi_bidirected_undirected = (
+            is_multi & (endpoints_v == _TAIL_AND_ARROW) & (endpoints_u == _TAIL_AND_ARROW)
+        )
+    else:
+        is_multi = np.zeros(endpoints_u.shape, dtype=bool)
+        multi_uv_bidirected = multi_vu_bidirected = is_multi
+        multi_uv_undirected = multi_vu_undirected = is_multi
+        multi_bidirected_undirected = is_multi
+
+    # Else, there is only one edge between the two nodes and this is
+    # either a DAG, or an equivalence class
+    is_circle = ~is_multi & ((endpoints_u == _CIRCLE) | (endpoints_v == _CIRCLE))
+    is_single = ~is_multi & ~is_circle
+
+    # there are no circle edges, implying this is not a PAG at least
+    # u <--> v
+    single_bidirected = is_single & (endpoints_v == _ARROW) & (endpoints_u == _ARROW)
+    # u -> v
+    single_uv_directed = is_single & (endpoints_v == _ARROW) & (endpoints_u == _TAIL)
+    # u <- v
+    single_vu_directed = is_single & (endpoints_u == _ARROW) & (endpoints_v == _TAIL)
+    # u -- v
+    single_undirected = is_single & (endpoints_v == _TAIL) & (endpoints_u == _TAIL)
+
+    # Endpoints contain a circle, where the endpoint at u (i.e. u o- v) is
+    # oriented from v to u, and the endpoint at v (i.e. u -o v) from u to v
+    circle_u = is_circle & (endpoints_u == _CIRCLE)
+    circle_v = is_circle & (endpoints_v == _CIRCLE)
+    arrow_u = is_circle & (endpoints_u == _ARROW)
+    arrow_v = is_circle & (endpoints_v == _ARROW)
+    tail_u = is_circle & (endpoints_u == _TAIL)
+    tail_v = is_circle & (endpoints_v == _TAIL)
+
+    # group the edges by their type
+    directed_pairs = _masked_pairs(
+        multi_uv_bidirected | multi_uv_undirected | single_uv_directed | arrow_v,
+        multi_vu_bidirected | multi_vu_undirected | single_vu_directed | arrow_u,
+    )
+    bidirected_pairs = _masked_pairs(
+        multi_uv_bidirected | multi_vu_bidirected | multi_bidirected_undirected | single_bidirected
+    )
+    undirected_pairs = _masked_pairs(
+        multi_uv_undirected
+        | multi_vu_undirected
+        | multi_bidirected_undirected
+        | single_undirected
+        | tail_v,
+        tail_u,
+    )
+    circle_pairs = _masked_pairs(circle_v, circle_u)
+    return directed_pairs, bidirected_pairs, undirected_pairs, circle_pairs
+
+
 def clearn_arr_to_graph(arr: ArrayLike, arr_idx: List[Node], graph_type: str) -> nx.MixedEdgeGraph:
     """Convert causal-learn array to a graph object.
 
@@ -154,11 +309,11 @@ def clearn_arr_to_graph(arr: ArrayLike, arr_idx: List[Node], graph_type: str) ->
         )
 
     unique_edge_nums = np.unique(arr)
-    try:
-        any(CLearnEndpoint(num) not in CLearnEndpoint for num in unique_edge_nums)
-    except ValueError as e:
+    if not np.isin(unique_edge_nums, _CLEARN_ENDPOINT_VALUES).all():
+        invalid_edge_nums = np.setdiff1d(unique_edge_nums, _CLEARN_ENDPOINT_VALUES)
         raise RuntimeError(
-            f"Some entries of array are not causal-learn specified, specifically: {e}"
+            f"Some entries of array are not causal-learn specified, specifically: "
+            f"{invalid_edge_nums.tolist()}"
         )
 
     # TODO: enable us to infer the type?
@@ -177,91 +332,54 @@ def clearn_arr_to_graph(arr: ArrayLike, arr_idx: List[Node], graph_type: str) ->
             f"'dag', 'admg', 'cpdag', 'pag'."
         )
 
-    # convert each non-zero array entry combination into
-    # an edge in the graph
-    triu_inds = np.triu_indices(n_nodes, k=1)
-    for udx, vdx in zip(*triu_inds):
-        endpoint_v = CLearnEndpoint(arr[vdx, udx])
-        endpoint_u = CLearnEndpoint(arr[udx, vdx])
-        u = arr_idx[udx]
-        v = arr_idx[vdx]
-
-        # First: check if there are two edges. If there
-        if any(
-            endpoint
-            in [
-                CLearnEndpoint.ARROW_AND_ARROW,
-                CLearnEndpoint.TAIL_AND_ARROW,
-                CLearnEndpoint.TAIL_AND_TAIL,
-            ]
-            for endpoint in (endpoint_u, endpoint_v)
-        ):
-            # u -> v and u <-> v
-            if (
-                endpoint_v == CLearnEndpoint.ARROW_AND_ARROW
-                and endpoint_u == CLearnEndpoint.TAIL_AND_ARROW
-            ):
-                graph.add_edge(u, v, edge_type=graph.directed_edge_name)
-                graph.add_edge(u, v, edge_type=graph.bidirected_edge_name)
-            # u <- v and u <-> v
-            elif (
-                endpoint_u == CLearnEndpoint.ARROW_AND_ARROW
-                and endpoint_v == CLearnEndpoint.TAIL_AND_ARROW
-            ):
-                graph.add_edge(v, u, edge_type=graph.directed_edge_name)
-                graph.add_edge(u, v, edge_type=graph.bidirected_edge_name)
-            # u -> v and u -- v
-            elif (endpoint_u == CLearnEndpoint.TAIL_AND_TAIL) and (
-                endpoint_v == CLearnEndpoint.TAIL_AND_ARROW
-            ):
-                graph.add_edge(u, v, edge_type=graph.directed_edge_name)
-                graph.add_edge(u, v, edge_type=graph.undirected_edge_name)
-            # u <- v and u -- v
-            elif (endpoint_v == CLearnEndpoint.TAIL_AND_TAIL) and (
-                endpoint_u == CLearnEndpoint.TAIL_AND_ARROW
-            ):
-                graph.add_edge(v, u, edge_type=graph.directed_edge_name)
-                graph.add_edge(u, v, edge_type=graph.undirected_edge_name)
-            # u -- v and u <-> v
-            elif (endpoint_v == CLearnEndpoint.TAIL_AND_ARROW) and (
-                endpoint_u == CLearnEndpoint.TAIL_AND_ARROW
-            ):
-                graph.add_edge(u, v, edge_type=graph.bidirected_edge_name)
-                graph.add_edge(u, v, edge_type=graph.undirected_edge_name)
-        # Else, there is only one edge between the two nodes and this is
-        # either a DAG, or an equivalence class
-        else:
-            # there are no circle edges, implying this is not a PAG at least
-            if not any(endpoint == CLearnEndpoint.CIRCLE for endpoint in (endpoint_u, endpoint_v)):
-                # u <--> v
-                if (endpoint_v == CLearnEndpoint.ARROW) and (endpoint_u == CLearnEndpoint.ARROW):
-                    graph.add_edge(u, v, edge_type=graph.bidirected_edge_name)
-                # u -> v
-                elif (endpoint_v == CLearnEndpoint.ARROW) and (endpoint_u == CLearnEndpoint.TAIL):
-                    graph.add_edge(u, v, edge_type=graph.directed_edge_name)
-                # u <- v
-                elif (endpoint_u == CLearnEndpoint.ARROW) and (endpoint_v == CLearnEndpoint.TAIL):
-                    graph.add_edge(v, u, edge_type=graph.directed_edge_name)
-                # u -- v
-                elif (endpoint_v == CLearnEndpoint.TAIL) and (endpoint_u == CLearnEndpoint.TAIL):
-                    graph.add_edge(u, v, edge_type=graph.undirected_edge_name)
-            else:
-                # Endpoints contain a circle...
-                # u o- v
-                if endpoint_u == CLearnEndpoint.CIRCLE:
-                    graph.add_edge(v, u, edge_type=graph.circle_edge_name)
-                elif endpoint_u == CLearnEndpoint.ARROW:
-                    graph.add_edge(v, u, edge_type=graph.directed_edge_name)
-                elif endpoint_u == CLearnEndpoint.TAIL:
-                    graph.add_edge(v, u, edge_type=graph.undirected_edge_name)
-
-                # u -o v
-                if endpoint_v == CLearnEndpoint.CIRCLE:
-                    graph.add_edge(u, v, edge_type=graph.circle_edge_name)
-                elif endpoint_v == CLearnEndpoint.ARROW:
-                    graph.add_edge(u, v, edge_type=graph.directed_edge_name)
-                elif endpoint_v == CLearnEndpoint.TAIL:
-                    graph.add_edge(u, v, edge_type=graph.undirected_edge_name)
+    # DAGs and CPDAGs are decoded without the two-edge endpoint patterns, so
+    # reject arrays that encode two edges between a pair of nodes
+    multi_edges = graph_type in ("admg", "pag")
+    if not multi_edges and np.isin(unique_edge_nums, _MULTI_EDGE_ENDPOINTS).any():
+        raise RuntimeError(
+            f"The array encodes two edges between a pair of nodes, which is not "
+            f"supported for graph type {graph_type}. Please use one of 'admg', 'pag'."
+        )
+
+    # the entries are valid endpoint values, so they fit in an int8, which
+    # reduces the memory traffic of the comparisons below
+    arr = arr.astype(np.int8, copy=False)
+
+    # add the nodes first, so the graph preserves the order of the array index
+    # regardless of the order in which edges are added
+    graph.add_nodes_from(arr_idx)
+
+    # without any endpoints, there are no edges to decode
+    if not unique_edge_nums.any():
+        return graph.to_directed() if graph_type == "dag" else graph
+
+    # the node names as an object array, so they can be indexed in bulk; unlike
+    # np.asarray, np.fromiter does not unpack nodes that are tuples
+    node_names = np.fromiter(arr_idx, dtype=object, count=n_nodes)
+
+    def _named_edges(pairs):
+        src, dst = pairs
+        return list(zip(node_names[src].tolist(), node_names[dst].tolist()))
+
+    # decode the array and then add each edge type with a single call
+    directed_pairs, bidirected_pairs, undirected_pairs, circle_pairs = _decode_clearn_arr(
+        arr, multi_edges=multi_edges
+    )
+    directed_edges = _named_edges(directed_pairs)
+    bidirected_edges = _named_edges(bidirected_pairs)
+    undirected_edges = _named_edges(undirected_pairs)
+    circle_edges = _named_edges(circle_pairs)
+
+    # the edge names are only looked up if there are edges of that type, since
+    # not all graph types have all edge types
+    if directed_edges:
+        graph.add_edges_from(directed_edges, edge_type=graph.directed_edge_name)
+    if bidirected_edges:
+        graph.add_edges_from(bidirected_edges, edge_type=graph.bidirected_edge_name)
+    if undirected_edges:
+        graph.add_edges_from(undirected_edges, edge_type=graph.undirected_edge_name)
+    if circle_edges:
+        graph.add_edges_from(circle_edges, edge_type=graph.circle_edge_name)
 
     if graph_type == "dag":
         graph = graph.to_directed()
@@ -289,8 +407,8 @@ def graph_to_arr(
     Returns
     -------
     arr : ArrayLike of shape (n_nodes, n_nodes)
-        The graph represented as a numpy array. See Notes for
-        more information.
+        The graph represented as a numpy array of ``np.int8`` endpoint values.
+        See Notes for more information.
     arr_idx : List of length (n_nodes)
         The list of nodes representing the order of the nodes
         in the ``arr``.
@@ -315,7 +433,25 @@ def graph_to_arr(
         arr, arr_idx = _graph_to_clearn_arr(G)
 
     if node_order is not None:
-        new_order = np.searchsorted(node_order, arr_idx)
-        arr = arr[np.ix_(new_order, new_order)]
+        if len(node_order) != len(arr_idx) or set(node_order) != set(arr_idx):
+            raise RuntimeError(
+                f"The node order should contain each node of the graph exactly once. "
+                f"The node order has nodes {list(node_order)}, but the graph has "
+                f"nodes {arr_idx}."
+            )
+
+        # map each node to its row/column in the array, so that ``node_order``
+        # does not need to be sorted
+        node_pos = {node: idx for idx, node in enumerate(arr_idx)}
+        new_order = np.fromiter(
+            (node_pos[node] for node in node_order), dtype=np.intp, count=len(node_order)
+        )
+
+        # permute the rows into a single buffer and then the columns back into
+        # ``arr``, which is not used elsewhere; since the indices are valid, the
+        # 'clip' mode lets np.take write into ``out`` without extra buffering
+        buf = np.empty_like(arr)
+        np.take(arr, new_order, axis=0, out=buf, mode="clip")
+        np.take(buf, new_order, axis=1, out=arr, mode="clip")
         arr_idx = [arr_idx[idx] for idx in new_order]
     return arr, arr_idx
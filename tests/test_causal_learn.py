@@ -9,6 +9,7 @@ from numpy.testing import assert_array_equal
 
 import pywhy_graphs
 from pywhy_graphs.array.export import clearn_arr_to_graph, graph_to_arr
+from pywhy_graphs.config import CLearnEndpoint
 
 
 def create_clearn_nodes(n_nodes):
@@ -191,6 +192,145 @@ def test_graph_to_arr_roundtrip(clearn_G: GeneralGraph, expected_G: nx.MixedEdge
     assert set(arr_idx) == set(nodes)
 
 
+@pytest.mark.parametrize(
+    "endpoint_x, endpoint_y, graph_type, expected_edges",
+    [
+        # x -> y and x <-> y
+        [
+            CLearnEndpoint.TAIL_AND_ARROW,
+            CLearnEndpoint.ARROW_AND_ARROW,
+            "admg",
+            {"directed": [("x", "y")], "bidirected": [("x", "y")]},
+        ],
+        # x <- y and x <-> y
+        [
+            CLearnEndpoint.ARROW_AND_ARROW,
+            CLearnEndpoint.TAIL_AND_ARROW,
+            "admg",
+            {"directed": [("y", "x")], "bidirected": [("x", "y")]},
+        ],
+        # x -> y and x -- y
+        [
+            CLearnEndpoint.TAIL_AND_TAIL,
+            CLearnEndpoint.TAIL_AND_ARROW,
+            "admg",
+            {"directed": [("x", "y")], "undirected": [("x", "y")]},
+        ],
+        # x <- y and x -- y
+        [
+            CLearnEndpoint.TAIL_AND_ARROW,
+            CLearnEndpoint.TAIL_AND_TAIL,
+            "admg",
+            {"directed": [("y", "x")], "undirected": [("x", "y")]},
+        ],
+        # x <-> y and x -- y
+        [
+            CLearnEndpoint.TAIL_AND_ARROW,
+            CLearnEndpoint.TAIL_AND_ARROW,
+            "admg",
+            {"bidirected": [("x", "y")], "undirected": [("x", "y")]},
+        ],
+        # x o-- y
+        [
+            CLearnEndpoint.CIRCLE,
+            CLearnEndpoint.TAIL,
+            "pag",
+            {"circle": [("y", "x")], "undirected": [("x", "y")]},
+        ],
+        # x --o y
+        [
+            CLearnEndpoint.TAIL,
+            CLearnEndpoint.CIRCLE,
+            "pag",
+            {"circle": [("x", "y")], "undirected": [("x", "y")]},
+        ],
+    ],
+)
+def test_clearn_arr_to_graph_endpoint_pairs(endpoint_x, endpoint_y, graph_type, expected_edges):
+    nodes = ["x", "y"]
+    arr = np.zeros((2, 2), dtype=int)
+    arr[0, 1] = endpoint_x.value
+    arr[1, 0] = endpoint_y.value
+
+    graph = clearn_arr_to_graph(arr, arr_idx=nodes, graph_type=graph_type)
+    for edge_type, subG in graph.get_graphs().items():
+        edges = expected_edges.get(edge_type, [])
+        if subG.is_directed():
+            assert set(subG.edges) == set(edges)
+        else:
+            assert {frozenset(edge) for edge in subG.edges} == {frozenset(edge) for edge in edges}
+
+    # converting the graph back should give the same array
+    test_arr, _ = graph_to_arr(graph, format="causal-learn", node_order=nodes)
+    assert_array_equal(arr, test_arr)
+
+
+def test_graph_to_arr_unsorted_node_order():
+    clearn_G, _ = pag()
+    arr = clearn_G.graph
+    nodes = [node.get_name() for node in clearn_G.nodes]
+    graph = clearn_arr_to_graph(arr, arr_idx=nodes, graph_type="pag")
+
+    # the node order does not need to be sorted
+    node_order = nodes[::-1]
+    test_arr, arr_idx = graph_to_arr(graph, format="causal-learn", node_order=node_order)
+    assert arr_idx == node_order
+    assert_array_equal(arr[::-1, ::-1], test_arr)
+
+    # the node order should contain each node exactly once
+    with pytest.raises(RuntimeError, match="each node of the graph exactly once"):
+        graph_to_arr(graph, format="causal-learn", node_order=node_order[:-1])
+    with pytest.raises(RuntimeError, match="each node of the graph exactly once"):
+        graph_to_arr(graph, format="causal-learn", node_order=node_order[:-1] + node_order[:1])
+    with pytest.raises(RuntimeError, match="each node of the graph exactly once"):
+        graph_to_arr(graph, format="causal-learn", node_order=node_order[:-1] + ["test"])
+
+
+@pytest.mark.parametrize("graph_type", ["admg", "cpdag", "pag"])
+def test_clearn_arr_to_graph_empty(graph_type):
+    nodes = ["x", "y", "z"]
+    arr = np.zeros((3, 3), dtype=int)
+
+    # the nodes are kept, even though there are no edges
+    graph = clearn_arr_to_graph(arr, arr_idx=nodes, graph_type=graph_type)
+    assert list(graph.nodes) == nodes
+    for subG in graph.get_graphs().values():
+        assert subG.number_of_edges() == 0
+
+
+def test_clearn_arr_to_graph_empty_dag():
+    nodes = ["x", "y", "z"]
+    arr = np.zeros((3, 3), dtype=int)
+
+    # DAGs are returned as a directed graph, which keeps the nodes
+    graph = clearn_arr_to_graph(arr, arr_idx=nodes, graph_type="dag")
+    assert isinstance(graph, nx.DiGraph)
+    assert list(graph.nodes) == nodes
+    assert graph.number_of_edges() == 0
+
+
+@pytest.mark.parametrize("graph_type", ["dag", "cpdag"])
+@pytest.mark.parametrize(
+    "endpoint_u, endpoint_v",
+    [
+        # u -> v and u -- v
+        [CLearnEndpoint.TAIL_AND_TAIL, CLearnEndpoint.TAIL_AND_ARROW],
+        # u -> v and u <-> v
+        [CLearnEndpoint.TAIL_AND_ARROW, CLearnEndpoint.ARROW_AND_ARROW],
+        # two-edge endpoint with a circle endpoint
+        [CLearnEndpoint.CIRCLE, CLearnEndpoint.TAIL_AND_ARROW],
+    ],
+)
+def test_clearn_arr_to_graph_multi_edge_errors(graph_type, endpoint_u, endpoint_v):
+    arr = np.zeros((2, 2), dtype=int)
+    arr[0, 1] = endpoint_u.value
+    arr[1, 0] = endpoint_v.value
+
+    # DAGs and CPDAGs cannot be decoded from two edges between a pair of nodes
+    with pytest.raises(RuntimeError, match="encodes two edges between a pair of nodes"):
+        clearn_arr_to_graph(arr, arr_idx=["x", "y"], graph_type=graph_type)
+
+
 def test_convert_clearn_errors():
     clearn_G, _ = dag()
 
@@ -210,3 +350,8 @@ def test_convert_clearn_errors():
     arr[0, 1] = 52
     with pytest.raises(RuntimeError, match="Some entries of array"):
         clearn_arr_to_graph(arr, arr_idx=nodes, graph_type="dag")
+
+    # the invalid entries are listed in the error
+    arr[0, 1] = -3
+    with pytest.raises(RuntimeError, match=r"specifically: \[-3\]"):
+        clearn_arr_to_graph(arr, arr_idx=nodes, graph_type="dag")